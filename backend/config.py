@@ -27,6 +27,9 @@ class Config:
     
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+
+    # Redis Configuration (optional - enables shared record store across workers)
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
     
     # Server Configuration
     PORT: int = int(os.getenv("PORT", "8000"))
@@ -39,16 +42,20 @@ class Config:
     
     # Feature Flags
     MOCK_AI: bool = os.getenv("MOCK_AI", "false").lower() == "true"
+
+    # Environment (read once at class load; env vars don't change mid-process)
+    IS_PRODUCTION: bool = os.getenv("ENVIRONMENT", "development").lower() == "production"
     
     # File Upload Limits
     MAX_FILE_SIZE_MB: int = 10
-    ALLOWED_FILE_TYPES: list = ["image/jpeg", "image/png", "image/jpg", "application/pdf"]
+    MAX_FILE_SIZE_BYTES: int = MAX_FILE_SIZE_MB * 1024 * 1024
+    ALLOWED_FILE_TYPES: frozenset = frozenset(["image/jpeg", "image/png", "image/jpg", "application/pdf"])
     
     # Supabase Storage
     STORAGE_BUCKET_NAME: str = "vaccine-records"
     
-    # Supported Compliance Standards
-    VALID_STANDARDS: list = ["cornell_tech", "us_cdc", "uk_nhs", "canada_health"]
+    # Supported Compliance Standards (frozenset for O(1) membership checks)
+    VALID_STANDARDS: frozenset = frozenset(["cornell_tech", "us_cdc", "uk_nhs", "canada_health"])
     
     @classmethod
     def validate(cls) -> list[str]:
@@ -72,7 +79,7 @@ class Config:
     @classmethod
     def is_production(cls) -> bool:
         """Check if running in production environment."""
-        return os.getenv("ENVIRONMENT", "development").lower() == "production"
+        return cls.IS_PRODUCTION
 
 
 # Create a singleton instance
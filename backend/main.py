@@ -9,39 +9,60 @@ This FastAPI application exposes the same core logic through two interfaces:
 The design demonstrates "Agentic Architecture" and "Product Engineering" principles.
 """
 
+import asyncio
+import hashlib
 import logging
+import os
 import uuid
-from datetime import datetime
-from typing import Optional, List, Dict
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, TYPE_CHECKING
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Body, status
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Body, status, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import httpx
-from supabase import create_client, Client
+import redis.asyncio as aioredis
+from cachetools import TTLCache
+from pydantic import ValidationError
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 # Import configuration
 from config import config
 
 # Import our data contract
 from schemas import (
-    ComplianceResult,
-    VaccineRecord,
-    VaccineStatus,
-    VaccineName,
     HealthResponse,
     UploadResult,
     StandardizationResult,
     StandardizationRequest,
+    StandardizationBatchItem,
     ComplianceStandard,
-    LanguageCode,
-    TranscriptionResult, 
-    TranslationResult,
-    AgentComplianceResponse
+    AgentComplianceResponse,
+    AsyncBatchSubmission,
+    AsyncBatchStatus
 )
 
 # Import core services
-from services import perform_standardization, analyze_image_with_ai, process_ai_result
+from services import (
+    perform_standardization,
+    perform_standardization_batch,
+    merge_standardization_results,
+    analyze_image_with_ai,
+    analyze_images_batch_with_ai,
+    submit_batch_analysis,
+    retrieve_batch_analysis,
+    downscale_image_for_ai,
+    process_ai_result,
+    build_agent_response,
+    aclose_openai_transport,
+    OPENAI_TIMEOUT_SECONDS
+)
+
+# Route-level deadline for the AI stage: leaves the SDK room for one retry on
+# top of its per-attempt timeout before the request is abandoned with a 504
+AI_DEADLINE_SECONDS = 2 * OPENAI_TIMEOUT_SECONDS
 
 # Configure Logging
 logging.basicConfig(
@@ -53,7 +74,7 @@ logger = logging.getLogger(__name__)
 # Validate configuration on startup
 missing_config = config.validate()
 if missing_config:
-    logger.warning(f"Missing required configuration: {', '.join(missing_config)}")
+    logger.warning("Missing required configuration: %s", ", ".join(missing_config))
     logger.warning("Some features may not work correctly.")
 
 # Initialize FastAPI with configuration
@@ -63,6 +84,7 @@ app = FastAPI(
     version=config.APP_VERSION,
     docs_url="/docs" if not config.is_production() else None,  # Disable docs in production
     redoc_url="/redoc" if not config.is_production() else None,
+    default_response_class=ORJSONResponse,  # C-accelerated JSON serialization
 )
 
 # Configure CORS for React frontend
@@ -74,10 +96,275 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory cache for uploaded records
-# NOTE: In a production environment with multiple workers, this should be 
-# replaced with Redis or a database to ensure state consistency across instances.
-uploaded_records: Dict[str, UploadResult] = {}
+# Records expire after 24 hours (applies to both Redis and in-memory caches)
+RECORD_TTL_SECONDS = 60 * 60 * 24
+
+# How many records the in-process caches hold before LRU eviction kicks in;
+# override per deployment via UPLOAD_CACHE_SIZE
+UPLOAD_CACHE_SIZE = int(os.getenv("UPLOAD_CACHE_SIZE", "10000"))
+
+# Bounded in-memory cache for uploaded records: TTL + maxsize eviction keep a
+# long-lived process from growing without limit.
+# When REDIS_URL is configured, records are also persisted to Redis so session
+# lookups are O(1) indexed reads and state is shared across uvicorn workers.
+# Without Redis the app falls back to this single-process cache.
+uploaded_records: TTLCache = TTLCache(maxsize=UPLOAD_CACHE_SIZE, ttl=RECORD_TTL_SECONDS)
+
+# Incremental per-session index, maintained at upload time so session lookups
+# don't re-scan every record in the process. Same bounds as the record cache
+# so sessions age out alongside their records.
+_session_record_ids: TTLCache = TTLCache(maxsize=UPLOAD_CACHE_SIZE, ttl=RECORD_TTL_SECONDS)
+
+# Memoized per-(record_id, standard) standardization results. Uploads are
+# immutable once cached, so these never need explicit invalidation; /report
+# merges them instead of re-standardizing every vaccine in the session.
+_std_result_cache: TTLCache = TTLCache(maxsize=UPLOAD_CACHE_SIZE, ttl=RECORD_TTL_SECONDS)
+
+# Aggregate report cache. Keyed by (session_id, standard, session version);
+# the version counter bumps on every upload, so a new record invalidates the
+# session's cached reports without any explicit eviction.
+_session_version: TTLCache = TTLCache(maxsize=UPLOAD_CACHE_SIZE, ttl=RECORD_TTL_SECONDS)
+_report_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+# OpenAI Batch API jobs awaiting completion: batch_id -> session/record
+# bookkeeping needed to fold results into the vault when they land. Kept
+# twice as long as records since the batch window alone is 24h.
+_pending_batches: TTLCache = TTLCache(maxsize=1024, ttl=2 * RECORD_TTL_SECONDS)
+
+# Precomputed enum lookup so standard validation/conversion is O(1) instead of
+# rebuilding a value list and scanning it on every request
+_STANDARD_BY_VALUE: Dict[str, ComplianceStandard] = {s.value: s for s in ComplianceStandard}
+
+# Rejection-message tails built once instead of re-joining the same sets on
+# every invalid request
+_ALLOWED_TYPES_DETAIL = f"Allowed types: {', '.join(sorted(config.ALLOWED_FILE_TYPES))}"
+_VALID_STANDARDS_DETAIL = f"Supported: {', '.join(sorted(config.VALID_STANDARDS))}"
+
+# Short-lived fast path for verify_vaccine_record: repeated verifies of the
+# same image URL (e.g. an agent checking several standards) skip the download
+# as well as the AI call. The content-hash cache in services still catches
+# identical bytes arriving under different URLs.
+_url_analysis_cache: TTLCache = TTLCache(maxsize=256, ttl=300)
+
+# Single-flight table for verify_vaccine_record: concurrent requests for the
+# same URL await the first caller's in-flight task instead of each paying
+# their own download + OpenAI call (thundering-herd protection in front of
+# the caches)
+_inflight_analyses: Dict[str, asyncio.Task] = {}
+
+_redis: Optional[aioredis.Redis] = (
+    aioredis.from_url(config.REDIS_URL, decode_responses=True)
+    if config.REDIS_URL else None
+)
+
+# Shared HTTP client for image downloads. Reusing one pooled client avoids a
+# fresh TCP + TLS handshake on every verify_vaccine_record call.
+_http_client = httpx.AsyncClient(
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+)
+
+
+@app.on_event("startup")
+async def warm_up_models() -> None:
+    """
+    Force pydantic core-schema builds for hot-path models.
+
+    The schemas use defer_build so importing the module stays cheap (fast cold
+    starts); rebuilding here keeps the one-time build cost out of the first
+    request instead.
+    """
+    import schemas
+    for model in (
+        schemas.TranscriptionResult,
+        schemas.TranslationResult,
+        schemas.VaccineRecord,
+        schemas.StandardizationResult,
+        schemas.UploadResult,
+        schemas.AgentComplianceResponse,
+    ):
+        model.model_rebuild()
+
+
+@app.on_event("shutdown")
+async def close_http_clients() -> None:
+    """Release pooled HTTP connections (downloads + OpenAI transport)."""
+    await _http_client.aclose()
+    await aclose_openai_transport()
+
+
+async def _store_record(result: UploadResult) -> None:
+    """
+    Cache an uploaded record locally and, if Redis is configured, persist it
+    under record:{record_id} with a session:{session_id} index set.
+    """
+    uploaded_records[result.record_id] = result
+    if result.session_id:
+        _session_record_ids.setdefault(result.session_id, []).append(result.record_id)
+        _session_version[result.session_id] = _session_version.get(result.session_id, 0) + 1
+    if _redis is not None:
+        try:
+            pipe = _redis.pipeline()
+            pipe.set(f"record:{result.record_id}", result.model_dump_json(), ex=RECORD_TTL_SECONDS)
+            if result.session_id:
+                pipe.sadd(f"session:{result.session_id}", result.record_id)
+                pipe.expire(f"session:{result.session_id}", RECORD_TTL_SECONDS)
+                # Bump the shared session version so report caches in every
+                # worker see the new upload, not just this process
+                pipe.incr(f"session_version:{result.session_id}")
+                pipe.expire(f"session_version:{result.session_id}", RECORD_TTL_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            logger.error("Redis write failed: %s", e, exc_info=True)
+
+
+async def _get_session_version(session_id: str) -> int:
+    """
+    Current version counter for a session's report cache key.
+
+    With Redis the counter is shared (INCRed by _store_record in whichever
+    worker handled the upload); on Redis errors we fall back to the local
+    counter, trading a possibly stale report for availability. Without Redis
+    the local counter is authoritative.
+    """
+    if _redis is not None:
+        try:
+            value = await _redis.get(f"session_version:{session_id}")
+            return int(value) if value else 0
+        except Exception as e:
+            logger.error("Redis session version read failed: %s", e, exc_info=True)
+    return _session_version.get(session_id, 0)
+
+
+async def _get_record(record_id: str) -> Optional[UploadResult]:
+    """
+    Fetch a single uploaded record, preferring the local cache over Redis.
+    """
+    record = uploaded_records.get(record_id)
+    if record is None and _redis is not None:
+        raw = None
+        try:
+            raw = await _redis.get(f"record:{record_id}")
+        except Exception as e:
+            logger.error("Redis read failed: %s", e, exc_info=True)
+        if raw:
+            try:
+                record = UploadResult.model_validate_json(raw)
+            except ValidationError as e:
+                # Distinct from Redis I/O failures: the stored payload itself
+                # is bad, which should never happen now that uploads are
+                # validated before persisting
+                logger.error("Stored record %s failed validation: %s", record_id, e)
+    return record
+
+
+async def _analyze_image_url(image_url: str) -> dict:
+    """
+    Download, downscale and analyze a remote image, caching the result by URL.
+
+    The download streams through a bounded buffer via the shared pooled
+    client — peak memory holds one copy instead of httpx's internal buffer
+    plus .content, and oversized remote images are abandoned mid-transfer
+    with the same limit uploads get. verify_vaccine_record runs this behind
+    a single-flight table so concurrent identical URLs share one execution.
+    """
+    buffer = bytearray()
+    async with _http_client.stream("GET", image_url) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes(65536):
+            buffer.extend(chunk)
+            if len(buffer) > config.MAX_FILE_SIZE_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Remote image exceeds {config.MAX_FILE_SIZE_MB}MB limit"
+                )
+    file_bytes = bytes(buffer)
+
+    # Downscale oversized scans before hashing/encoding, so resized
+    # duplicates also hit the content cache
+    file_bytes = await asyncio.to_thread(downscale_image_for_ai, file_bytes)
+
+    data = await asyncio.wait_for(
+        analyze_image_with_ai(file_bytes, config.OPENAI_API_KEY),
+        AI_DEADLINE_SECONDS
+    )
+    _url_analysis_cache[image_url] = data
+    return data
+
+
+def _standardize_record_cached(uploaded_record: UploadResult, standard: str) -> StandardizationResult:
+    """
+    Standardize a cached upload against a standard, memoizing the result.
+
+    perform_standardization is pure and uploads are immutable, so the result
+    for a given (record_id, standard) pair never changes.
+    """
+    key = (uploaded_record.record_id, standard)
+    result = _std_result_cache.get(key)
+    if result is None:
+        result = perform_standardization(standard, uploaded_record.extracted_vaccines)
+        _std_result_cache[key] = result
+    return result
+
+
+async def _get_session_records(session_id: str) -> List[UploadResult]:
+    """
+    Fetch all uploaded records for a session.
+
+    With Redis this is one SMEMBERS plus a pipelined MGET; without it we fall
+    back to scanning the in-process dict.
+    """
+    if _redis is not None:
+        try:
+            record_ids = await _redis.smembers(f"session:{session_id}")
+            if not record_ids:
+                return []
+            pipe = _redis.pipeline()
+            for record_id in record_ids:
+                pipe.get(f"record:{record_id}")
+            rows = await pipe.execute()
+        except Exception as e:
+            logger.error("Redis session lookup failed: %s", e, exc_info=True)
+        else:
+            records = []
+            for raw in rows:
+                if not raw:
+                    continue
+                try:
+                    records.append(UploadResult.model_validate_json(raw))
+                except ValidationError as e:
+                    # Bad stored payload, not a Redis failure; skip the row
+                    # but say what actually happened
+                    logger.error("Stored record in session %s failed validation: %s", session_id, e)
+            return records
+    # In-memory fallback: walk the session's record ids instead of scanning
+    # every record in the process. Ids whose records have aged out of the TTL
+    # cache are skipped.
+    records = []
+    for record_id in _session_record_ids.get(session_id, []):
+        record = uploaded_records.get(record_id)
+        if record is not None:
+            records.append(record)
+    return records
+
+# Lazily-initialized Supabase client singleton.
+# Client construction parses URLs and allocates HTTP/TLS state, so we build it
+# once and reuse it across requests instead of re-creating it per call.
+# The supabase import itself is deferred here too: it pulls in postgrest,
+# gotrue, realtime and storage3, which is pure overhead for cold starts that
+# only ever serve /health.
+_supabase: Optional["Client"] = None
+
+
+def get_supabase() -> "Client":
+    """
+    Return the shared Supabase client, creating it on first use.
+    """
+    global _supabase
+    if _supabase is None:
+        from supabase import create_client
+        _supabase = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
+    return _supabase
 
 # Helper for Analytics
 async def log_analytics_event(session_id: Optional[str], event_type: str, data: dict = None) -> None:
@@ -93,14 +380,18 @@ async def log_analytics_event(session_id: Optional[str], event_type: str, data:
         if not config.SUPABASE_URL or not config.SUPABASE_KEY or not session_id:
             return
             
-        supabase: Client = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
-        supabase.table("analytics_events").insert({
-            "session_id": session_id,
-            "event_type": event_type,
-            "event_data": data or {}
-        }).execute()
+        supabase = get_supabase()
+        # supabase-py is synchronous; run the insert in a worker thread so the
+        # event loop stays free to serve other requests.
+        await asyncio.to_thread(
+            lambda: supabase.table("analytics_events").insert({
+                "session_id": session_id,
+                "event_type": event_type,
+                "event_data": data or {}
+            }).execute()
+        )
     except Exception as e:
-        logger.error(f"Analytics logging failed: {e}", exc_info=True)
+        logger.error("Analytics logging failed: %s", e, exc_info=True)
 
 
 
@@ -109,10 +400,12 @@ async def log_analytics_event(session_id: Optional[str], event_type: str, data:
 # ============================================================================
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(response: Response):
     """
     Health check endpoint to verify service is running.
     """
+    # The payload is static, so let pollers cache it briefly
+    response.headers["Cache-Control"] = "public, max-age=60"
     return HealthResponse(
         status="running",
         mode="REST + MCP",
@@ -127,6 +420,8 @@ async def health_check():
 
 @app.post("/upload", response_model=UploadResult, status_code=status.HTTP_200_OK)
 async def upload_vaccine_record(
+    request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="Vaccination record image (JPG, PNG, PDF)"),
     session_id: Optional[str] = Form(None, description="Optional session ID for tracking")
 ):
@@ -152,57 +447,58 @@ async def upload_vaccine_record(
     if file.content_type not in config.ALLOWED_FILE_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid file type '{file.content_type}'. Allowed types: {', '.join(config.ALLOWED_FILE_TYPES)}"
+            detail=f"Invalid file type '{file.content_type}'. {_ALLOWED_TYPES_DETAIL}"
         )
     
-    # Read file bytes
-    file_bytes = await file.read()
-    
-    # Validate file size
-    max_size = config.MAX_FILE_SIZE_MB * 1024 * 1024
-    if len(file_bytes) > max_size:
+    # NOTE: by the time this handler runs, Starlette has already received the
+    # full multipart body into the UploadFile spool (disk-backed past 1MB) —
+    # form parsing happens during dependency resolution, so nothing here can
+    # stop the transfer at the network level. What these guards do provide:
+    # the Content-Length check 413s oversized requests without touching the
+    # spool at all, and the chunked read below caps how much of the spool is
+    # ever materialized in RAM before rejecting.
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > config.MAX_FILE_SIZE_BYTES + 4096:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"File size exceeds {config.MAX_FILE_SIZE_MB}MB limit"
         )
+
+    # Read the spool in chunks, giving up at the first chunk past the limit
+    # so at most ~10MB of an oversized upload is ever held in memory
+    buffer = bytearray()
+    while chunk := await file.read(64 * 1024):
+        buffer.extend(chunk)
+        if len(buffer) > config.MAX_FILE_SIZE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File size exceeds {config.MAX_FILE_SIZE_MB}MB limit"
+            )
+    file_bytes = bytes(buffer)
     
     try:
         # Generate unique record ID
-        record_id = str(uuid.uuid4())
-        
-        # Process with AI
-        data = await analyze_image_with_ai(file_bytes, config.OPENAI_API_KEY)
+        # .hex is faster than str() and yields a shorter, URL/filename-clean key
+        record_id = uuid.uuid4().hex
         
+        # Process with AI and upload to Supabase Storage concurrently:
+        # the two operations are independent, so the endpoint's latency is
+        # max(T_openai, T_storage) rather than their sum. The storage helper
+        # runs in a thread (supabase-py is sync) and never raises.
+        # Downscale oversized camera scans off the event loop before base64
+        # encoding; the original bytes still go to storage untouched
+        ai_bytes = await asyncio.to_thread(downscale_image_for_ai, file_bytes, file.content_type)
+
+        data, image_url = await asyncio.gather(
+            asyncio.wait_for(
+                analyze_image_with_ai(ai_bytes, config.OPENAI_API_KEY),
+                AI_DEADLINE_SECONDS
+            ),
+            asyncio.to_thread(_upload_to_storage, record_id, file_bytes, file.content_type)
+        )
+
         # Map to our internal schemas using shared helper
         transcription, translation, extracted_vaccines = process_ai_result(data)
-        
-        # Upload to Supabase Storage
-        image_url = None
-        try:
-            if config.SUPABASE_URL and config.SUPABASE_KEY:
-                # Initialize Supabase client
-                supabase: Client = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
-                
-                # Create filename
-                filename = f"{record_id}.jpg"
-                
-                # Upload
-                bucket_name = config.STORAGE_BUCKET_NAME
-                supabase.storage.from_(bucket_name).upload(
-                    path=filename,
-                    file=file_bytes,
-                    file_options={"content-type": "image/jpeg"}
-                )
-                
-                # Get Public URL
-                image_url = f"{config.SUPABASE_URL}/storage/v1/object/public/{bucket_name}/{filename}"
-            else:
-                logger.warning("Supabase credentials missing, skipping storage upload.")
-                image_url = f"https://placeholder.com/mock-upload/{record_id}.jpg"
-            
-        except Exception as e:
-            logger.error(f"Supabase Upload Failed: {e}", exc_info=True)
-            image_url = f"https://placeholder.com/failed-upload/{record_id}.jpg"
 
         # Create result
         result = UploadResult(
@@ -212,41 +508,374 @@ async def upload_vaccine_record(
             extracted_vaccines=extracted_vaccines,
             image_url=image_url,
             session_id=session_id,
-            uploaded_at=datetime.utcnow().isoformat()
+            uploaded_at=datetime.now(timezone.utc).isoformat()
         )
         
-        # Cache the uploaded record
-        uploaded_records[record_id] = result
-        
-        # Log Analytics
-        await log_analytics_event(session_id, "UPLOAD_COMPLETE", {"record_id": record_id})
+        # Cache the uploaded record (and persist to Redis when configured)
+        await _store_record(result)
         
+        # Log Analytics in the background so the response doesn't wait on it
+        background_tasks.add_task(log_analytics_event, session_id, "UPLOAD_COMPLETE", {"record_id": record_id})
+
         return result
-        
+
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="AI analysis timed out. Please try again."
+        )
     except Exception as e:
-        logger.error(f"Error in upload_vaccine_record: {str(e)}")
+        logger.error("Error in upload_vaccine_record: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Upload failed: {str(e)}"
         )
 
 
+@app.post("/upload/batch", response_model=List[UploadResult], status_code=status.HTTP_200_OK)
+async def upload_vaccine_records_batch(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(..., description="Up to 10 vaccination record images"),
+    session_id: Optional[str] = Form(None, description="Optional session ID for tracking")
+):
+    """
+    Upload and extract several vaccine record images in one request.
+
+    All images are sent to the vision model as parts of a single call (one
+    "pages" array back), amortizing the fixed prompt and network cost across
+    a multi-page record instead of paying one model round-trip per image.
+
+    Raises:
+        HTTPException: If the batch is too large or a file is invalid
+    """
+    MAX_BATCH_FILES = 10
+    MAX_BATCH_BYTES = 20 * 1024 * 1024
+
+    if not files or len(files) > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch must contain between 1 and {MAX_BATCH_FILES} files"
+        )
+
+    file_payloads = []
+    total_bytes = 0
+    for file in files:
+        if file.content_type not in config.ALLOWED_FILE_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file type '{file.content_type}'. {_ALLOWED_TYPES_DETAIL}"
+            )
+        file_bytes = await file.read()
+        total_bytes += len(file_bytes)
+        if len(file_bytes) > config.MAX_FILE_SIZE_BYTES or total_bytes > MAX_BATCH_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Batch exceeds per-file {config.MAX_FILE_SIZE_MB}MB or total 20MB limit"
+            )
+        file_payloads.append((file, file_bytes))
+
+    try:
+        record_ids = [uuid.uuid4().hex for _ in file_payloads]
+
+        # Downscale off the loop, then one fused vision call for every page
+        ai_images = [
+            await asyncio.to_thread(downscale_image_for_ai, file_bytes, file.content_type)
+            for file, file_bytes in file_payloads
+        ]
+        try:
+            pages = await analyze_images_batch_with_ai(ai_images, config.OPENAI_API_KEY)
+        except Exception as e:
+            # Fall back to fanning out one call per image; the gather still
+            # runs them concurrently and the services-level semaphore keeps
+            # the burst inside the OpenAI rate limits
+            logger.warning("Fused batch analysis failed (%s); falling back to per-image calls", e)
+            pages = await asyncio.gather(*[
+                analyze_image_with_ai(img, config.OPENAI_API_KEY) for img in ai_images
+            ])
+
+        # Storage uploads are independent; run them concurrently in threads
+        image_urls = await asyncio.gather(*[
+            asyncio.to_thread(_upload_to_storage, record_id, file_bytes, file.content_type)
+            for record_id, (file, file_bytes) in zip(record_ids, file_payloads)
+        ])
+
+        # One timestamp for the whole batch
+        uploaded_at = datetime.now(timezone.utc).isoformat()
+
+        results = []
+        for record_id, page, image_url in zip(record_ids, pages, image_urls):
+            transcription, translation, extracted_vaccines = process_ai_result(page)
+            result = UploadResult(
+                record_id=record_id,
+                transcription=transcription,
+                translation=translation,
+                extracted_vaccines=extracted_vaccines,
+                image_url=image_url,
+                session_id=session_id,
+                uploaded_at=uploaded_at
+            )
+            await _store_record(result)
+            results.append(result)
+
+        background_tasks.add_task(log_analytics_event, session_id, "BATCH_UPLOAD_COMPLETE", {
+            "record_ids": record_ids,
+            "count": len(record_ids)
+        })
+
+        return results
+
+    except Exception as e:
+        logger.error("Error in upload_vaccine_records_batch: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch upload failed: {str(e)}"
+        )
+
+
+@app.post("/upload/async-batch", response_model=AsyncBatchSubmission, status_code=status.HTTP_202_ACCEPTED)
+async def upload_vaccine_records_async_batch(
+    files: List[UploadFile] = File(..., description="Vaccination record images for overnight processing"),
+    session_id: Optional[str] = Form(None, description="Optional session ID for tracking")
+):
+    """
+    Queue a non-interactive bulk analysis through the OpenAI Batch API.
+
+    Images are uploaded to storage immediately, but analysis runs inside
+    OpenAI's 24-hour batch window at half the live-call price — suited to
+    onboarding drives, not interactive uploads. Poll GET /batch/{batch_id};
+    records appear in the session once the batch completes.
+    """
+    if not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No files provided")
+
+    file_payloads = []
+    for file in files:
+        if file.content_type not in config.ALLOWED_FILE_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid file type '{file.content_type}'. {_ALLOWED_TYPES_DETAIL}"
+            )
+        file_bytes = await file.read()
+        if len(file_bytes) > config.MAX_FILE_SIZE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File size exceeds {config.MAX_FILE_SIZE_MB}MB limit"
+            )
+        file_payloads.append((file, file_bytes))
+
+    try:
+        record_ids = [uuid.uuid4().hex for _ in file_payloads]
+
+        ai_images = [
+            await asyncio.to_thread(downscale_image_for_ai, file_bytes, file.content_type)
+            for file, file_bytes in file_payloads
+        ]
+
+        # Storage can complete now; only the analysis is deferred
+        image_urls = await asyncio.gather(*[
+            asyncio.to_thread(_upload_to_storage, record_id, file_bytes, file.content_type)
+            for record_id, (file, file_bytes) in zip(record_ids, file_payloads)
+        ])
+
+        batch_id = await submit_batch_analysis(
+            list(zip(record_ids, ai_images)), config.OPENAI_API_KEY
+        )
+        _pending_batches[batch_id] = {
+            "session_id": session_id,
+            "records": list(zip(record_ids, image_urls))
+        }
+
+        return AsyncBatchSubmission(batch_id=batch_id, record_ids=record_ids)
+
+    except Exception as e:
+        logger.error("Error in upload_vaccine_records_async_batch: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch submission failed: {str(e)}"
+        )
+
+
+@app.get("/batch/{batch_id}", response_model=AsyncBatchStatus)
+async def get_batch_status(batch_id: str):
+    """
+    Poll an asynchronous analysis batch; completed results are folded into
+    the vault exactly like live uploads.
+    """
+    pending = _pending_batches.get(batch_id)
+    if pending is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found (unknown id, or it expired from this worker)."
+        )
+
+    record_ids = [record_id for record_id, _ in pending["records"]]
+    try:
+        batch_status, analyses = await retrieve_batch_analysis(
+            batch_id, config.OPENAI_API_KEY, expected_ids=record_ids
+        )
+    except Exception as e:
+        logger.error("Batch status lookup failed: %s", e)
+        raise HTTPException(status_code=502, detail=f"Batch status lookup failed: {str(e)}")
+
+    records_ready = 0
+    if batch_status == "completed":
+        uploaded_at = datetime.now(timezone.utc).isoformat()
+        for record_id, image_url in pending["records"]:
+            data = analyses.get(record_id)
+            if data is None:
+                logger.warning("Batch %s returned no analysis for record %s", batch_id, record_id)
+                continue
+            transcription, translation, extracted_vaccines = process_ai_result(data)
+            await _store_record(UploadResult(
+                record_id=record_id,
+                transcription=transcription,
+                translation=translation,
+                extracted_vaccines=extracted_vaccines,
+                image_url=image_url,
+                session_id=pending["session_id"],
+                uploaded_at=uploaded_at
+            ))
+            records_ready += 1
+        _pending_batches.pop(batch_id, None)
+
+    return AsyncBatchStatus(
+        batch_id=batch_id,
+        status=batch_status,
+        record_ids=record_ids,
+        records_ready=records_ready
+    )
+
+
 @app.get("/records/{session_id}", response_model=List[UploadResult])
-async def get_session_records(session_id: str):
+async def get_session_records(session_id: str, request: Request, response: Response):
     """
     Retrieve all uploaded records for a specific session.
+
+    Sends an ETag derived from the session's record ids so polling clients can
+    revalidate with If-None-Match and skip re-serializing an unchanged list.
     """
-    session_records = [
-        record for record in uploaded_records.values() 
-        if record.session_id == session_id
-    ]
+    session_records = await _get_session_records(session_id)
+
+    etag = hashlib.md5(
+        "|".join(sorted(r.record_id for r in session_records)).encode()
+    ).hexdigest()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, must-revalidate"
     return session_records
 
 
+# Storage extension/content-type per allowed upload type, so PNGs and PDFs
+# aren't mislabeled as JPEGs in the bucket (which breaks later rendering)
+_STORAGE_FORMAT_BY_TYPE = {
+    "image/jpeg": ("jpg", "image/jpeg"),
+    "image/jpg": ("jpg", "image/jpeg"),
+    "image/png": ("png", "image/png"),
+    "application/pdf": ("pdf", "application/pdf"),
+}
+
+
+def _upload_to_storage(record_id: str, file_bytes: bytes, content_type: str = "image/jpeg") -> str:
+    """
+    Upload the raw file bytes to Supabase Storage and return its public URL.
+
+    Takes bytes, not a file handle: storage3's upload() only accepts
+    BufferedReader/bytes/FileIO/paths and treats anything else as a path to
+    open(), so e.g. an UploadFile's SpooledTemporaryFile would fail.
+
+    Never raises: on failure (or missing credentials) a placeholder URL is
+    returned so the upload pipeline can still complete.
+    """
+    ext, storage_type = _STORAGE_FORMAT_BY_TYPE.get(content_type, ("jpg", "image/jpeg"))
+    try:
+        if config.SUPABASE_URL and config.SUPABASE_KEY:
+            supabase = get_supabase()
+            filename = f"{record_id}.{ext}"
+            bucket_name = config.STORAGE_BUCKET_NAME
+            bucket = supabase.storage.from_(bucket_name)
+            bucket.upload(
+                path=filename,
+                file=file_bytes,
+                file_options={"content-type": storage_type}
+            )
+            # Let the SDK construct the canonical public URL instead of
+            # hand-building the storage path
+            return bucket.get_public_url(filename)
+        else:
+            logger.warning("Supabase credentials missing, skipping storage upload.")
+            return f"https://placeholder.com/mock-upload/{record_id}.{ext}"
+    except Exception as e:
+        logger.error("Supabase Upload Failed: %s", e, exc_info=True)
+        return f"https://placeholder.com/failed-upload/{record_id}.{ext}"
+
+
+def _persist_compliance_result(db_record) -> None:
+    """
+    Save one standardization result (dict) or a batch of them (list of dicts)
+    to the database. Runs as a background task.
+    """
+    try:
+        if config.SUPABASE_URL and config.SUPABASE_KEY:
+            supabase = get_supabase()
+            supabase.table("compliance_results").insert(db_record).execute()
+    except Exception as e:
+        logger.warning("Failed to save to database: %s", e)
+
+
+@app.post("/standardize/batch", response_model=List[StandardizationResult])
+async def standardize_records_batch(
+    items: List[StandardizationBatchItem],
+    background_tasks: BackgroundTasks
+):
+    """
+    Standardize several uploaded records in one call.
+
+    Accepts a list of (record_id, standard) pairs and persists all results
+    with a single batched insert instead of one round-trip per pair — e.g.
+    checking one record against all four standards costs one DB write.
+
+    Raises:
+        HTTPException: If any referenced record is not found
+    """
+    results = []
+    db_records = []
+    processed_at = datetime.now(timezone.utc).isoformat()
+
+    for item in items:
+        uploaded_record = await _get_record(item.record_id)
+        if uploaded_record is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Record '{item.record_id}' not found. Please upload first."
+            )
+
+        result = _standardize_record_cached(uploaded_record, item.standard.value)
+        results.append(result)
+        db_records.append({
+            "record_id": item.record_id,
+            "session_id": uploaded_record.session_id,
+            "standard": item.standard.value,
+            "transcription": uploaded_record.transcription.model_dump(mode='json'),
+            "translation": uploaded_record.translation.model_dump(mode='json'),
+            "standardization": result.model_dump(mode='json'),
+            "image_url": uploaded_record.image_url,
+            "processed_at": processed_at
+        })
+
+    if db_records:
+        # Supabase/PostgREST accepts an array insert: N rows, one round-trip
+        background_tasks.add_task(_persist_compliance_result, db_records)
+
+    return results
+
+
 @app.post("/standardize/{standard}", response_model=StandardizationResult)
 async def standardize_record(
     standard: str,
-    request: StandardizationRequest
+    request: StandardizationRequest,
+    background_tasks: BackgroundTasks
 ):
     """
     Standardize an uploaded record against a specific compliance standard.
@@ -265,52 +894,47 @@ async def standardize_record(
     if standard not in config.VALID_STANDARDS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid standard '{standard}'. Supported: {', '.join(config.VALID_STANDARDS)}"
+            detail=f"Invalid standard '{standard}'. {_VALID_STANDARDS_DETAIL}"
         )
     
     # Fetch uploaded record from cache
-    if request.record_id not in uploaded_records:
+    uploaded_record = await _get_record(request.record_id)
+    if uploaded_record is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Record not found. Please upload first."
         )
-        
-    uploaded_record = uploaded_records[request.record_id]
-    
-    # Perform standardization using the shared helper
-    result = perform_standardization(standard, uploaded_record.extracted_vaccines)
-    
-    # Save to Database
-    try:
-        if config.SUPABASE_URL and config.SUPABASE_KEY:
-            # Initialize Supabase client
-            supabase: Client = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
-            
-            db_record = {
-                "record_id": request.record_id,
-                "session_id": uploaded_record.session_id,
-                "standard": standard,
-                "transcription": uploaded_record.transcription.model_dump(mode='json'),
-                "translation": uploaded_record.translation.model_dump(mode='json'),
-                "standardization": result.model_dump(mode='json'),
-                "image_url": uploaded_record.image_url,
-                "processed_at": datetime.utcnow().isoformat()
-            }
-            
-            # Insert into DB
-            supabase.table("compliance_results").insert(db_record).execute()
-        
-    except Exception as e:
-        logger.warning(f"Failed to save to database: {e}")
     
-    # Log Analytics
-    await log_analytics_event(uploaded_record.session_id, "STANDARDIZATION_RUN", {
+    # Perform standardization using the shared memoized helper
+    result = _standardize_record_cached(uploaded_record, standard)
+
+    # Serialize once and reuse the payload for both the DB row and the HTTP
+    # response, so Pydantic's JSON-mode dump runs a single time per request
+    result_payload = result.model_dump(mode='json')
+
+    # Save to Database in the background (the response doesn't depend on it)
+    db_record = {
+        "record_id": request.record_id,
+        "session_id": uploaded_record.session_id,
+        "standard": standard,
+        "transcription": uploaded_record.transcription.model_dump(mode='json'),
+        "translation": uploaded_record.translation.model_dump(mode='json'),
+        "standardization": result_payload,
+        "image_url": uploaded_record.image_url,
+        "processed_at": datetime.now(timezone.utc).isoformat()
+    }
+    background_tasks.add_task(_persist_compliance_result, db_record)
+
+    # Log Analytics in the background
+    background_tasks.add_task(log_analytics_event, uploaded_record.session_id, "STANDARDIZATION_RUN", {
         "record_id": request.record_id,
         "standard": standard,
         "is_compliant": result.is_compliant
     })
-    
-    return result
+
+    # Returning the pre-serialized payload lets FastAPI skip a second
+    # model -> JSON pass over the same result
+    return ORJSONResponse(result_payload)
 
 
 @app.post("/report/{standard}", response_model=StandardizationResult)
@@ -322,33 +946,55 @@ async def generate_session_report(
     Generate an aggregate compliance report for a full session (Unified View).
     """
     # Validate standard
-    valid_standards = ["cornell_tech", "us_cdc", "uk_nhs", "canada_health"]
-    if standard not in valid_standards:
+    if standard not in config.VALID_STANDARDS:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid standard. Supported: {', '.join(valid_standards)}"
+            detail=f"Invalid standard. {_VALID_STANDARDS_DETAIL}"
         )
 
+    # Repeated polls of an unchanged session collapse to a cache lookup; the
+    # version component (shared via Redis when configured) invalidates on
+    # upload regardless of which worker handled it
+    cache_key = (session_id, standard, await _get_session_version(session_id))
+    cached_report = _report_cache.get(cache_key)
+    if cached_report is not None:
+        return cached_report
+
     # Get all records for session
-    session_records = [r for r in uploaded_records.values() if r.session_id == session_id]
-    
+    session_records = await _get_session_records(session_id)
+
     if not session_records:
         return StandardizationResult(
-            standard=ComplianceStandard(standard) if standard in [s.value for s in ComplianceStandard] else ComplianceStandard.US_CDC,
+            standard=_STANDARD_BY_VALUE.get(standard, ComplianceStandard.US_CDC),
             is_compliant=False,
             records=[],
             missing_vaccines=[],
             compliance_notes="No records found for this session."
         )
 
-    # Aggregate all vaccines
-    all_vaccines = []
+    # Merge the per-record standardizations (memoized, and shared with the
+    # /standardize endpoints) instead of re-standardizing every vaccine.
+    # Records missing from the memo are standardized together in one batch
+    # pass that resolves the standard's requirements once.
+    per_record_results = []
+    missed_records = []
     for r in session_records:
-        all_vaccines.extend(r.extracted_vaccines)
-        
-    # Standardize aggregated list
-    result = perform_standardization(standard, all_vaccines)
-    
+        cached = _std_result_cache.get((r.record_id, standard))
+        if cached is None:
+            missed_records.append(r)
+        else:
+            per_record_results.append(cached)
+    if missed_records:
+        batch_results = perform_standardization_batch(
+            standard, [r.extracted_vaccines for r in missed_records]
+        )
+        for r, res in zip(missed_records, batch_results):
+            _std_result_cache[(r.record_id, standard)] = res
+        per_record_results.extend(batch_results)
+
+    result = merge_standardization_results(standard, per_record_results)
+    _report_cache[cache_key] = result
+
     return result
 
 
@@ -366,49 +1012,53 @@ async def verify_vaccine_record(
     MCP Tool (HTTP Adapter): Verify a vaccination record from an image URL.
     Returns an agent-optimized, flat response.
     """
-    
+    # Fail fast on bad input before spending a download and an OpenAI call
+    if standard not in config.VALID_STANDARDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid standard '{standard}'. {_VALID_STANDARDS_DETAIL}"
+        )
+    if not image_url.startswith(("http://", "https://")):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="image_url must be an http(s) URL."
+        )
+
     try:
-        # Download image from URL
-        async with httpx.AsyncClient() as client:
-            response = await client.get(image_url)
-            response.raise_for_status()
-            file_bytes = response.content
-            
-        # Process with AI
-        data = await analyze_image_with_ai(file_bytes, config.OPENAI_API_KEY)
+        # Reuse a recent analysis of this URL if we have one; otherwise join
+        # (or start) the single in-flight analysis for it, so concurrent
+        # verifies of the same URL share one download and one OpenAI call
+        data = _url_analysis_cache.get(image_url)
+        if data is None:
+            task = _inflight_analyses.get(image_url)
+            if task is None:
+                task = asyncio.create_task(_analyze_image_url(image_url))
+                _inflight_analyses[image_url] = task
+                try:
+                    data = await task
+                finally:
+                    _inflight_analyses.pop(image_url, None)
+            else:
+                data = await task
         
         # Map to schemas
         transcription, translation, extracted_vaccines = process_ai_result(data)
         
         # Stage 3: Standardization
         standardization = perform_standardization(standard, extracted_vaccines)
-        
-        # Construct Agent-Optimized Result
-        found_vax_names = [v.vaccine_name.value for v in standardization.records]
-        missing_vax_names = [v.value for v in standardization.missing_vaccines]
-        
-        evidence = {
-            "vaccines": [
-                {
-                    "name": v.vaccine_name.value,
-                    "date": v.date,
-                    "provider": v.provider
-                } for v in standardization.records
-            ],
-            "original_text_snippet": transcription.raw_text[:200] + "..." if len(transcription.raw_text) > 200 else transcription.raw_text
-        }
-        
-        return AgentComplianceResponse(
-            is_compliant=standardization.is_compliant,
-            missing_vaccines=missing_vax_names,
-            extracted_vaccines=found_vax_names,
-            compliance_summary=standardization.compliance_notes or "Analysis complete.",
-            evidence=evidence,
-            overall_confidence=transcription.confidence
+
+        # Construct Agent-Optimized Result (shared single-pass helper)
+        return build_agent_response(standardization, transcription)
+
+    except HTTPException:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="AI analysis timed out. Please try again."
         )
-        
     except Exception as e:
-        logger.error(f"Vaccine record verification failed: {e}")
+        logger.error("Vaccine record verification failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Vaccine record verification failed: {str(e)}"
@@ -417,15 +1067,18 @@ async def verify_vaccine_record(
 
 if __name__ == "__main__":
     import uvicorn
-    
-    print("=" * 80)
-    print("🚀 Personal Vault - Medical Compliance Microservice v2.1")
-    print("=" * 80)
-    
+
+    logger.info("🚀 Personal Vault - Medical Compliance Microservice v%s", config.APP_VERSION)
+
+    # The auto-reloader's filesystem watcher is dev-only overhead; never run
+    # it in production. uvloop + httptools ship with uvicorn[standard]; pin
+    # them explicitly so the faster loop/parser can't silently fall back.
     uvicorn.run(
         "main:app",
         host=config.HOST,
         port=config.PORT,
-        reload=True,
+        reload=not config.is_production(),
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
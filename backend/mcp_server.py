@@ -18,10 +18,17 @@ from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
 # Import core services and schemas
-from services import analyze_image_with_ai, perform_standardization, process_ai_result
+import asyncio
+
+from services import (
+    analyze_image_with_ai,
+    perform_standardization,
+    process_ai_result,
+    build_agent_response,
+    downscale_image_for_ai
+)
 from schemas import (
-    ComplianceResult, 
-    AgentComplianceResponse, 
+    ComplianceResult,
     AgentError,
     LanguageCode
 )
@@ -33,6 +40,21 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 # Initialize MCP Server
 mcp = FastMCP("Medical Vault")
 
+# Shared HTTP client (created lazily so importing the module stays cheap).
+# Reusing one pooled client avoids a TCP + TLS handshake per image download.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared pooled HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    return _http_client
+
 def _create_error(code: str, message: str, suggestion: str = None) -> str:
     """Helper to create a standardized machine-readable error response."""
     return json.dumps({
@@ -80,27 +102,29 @@ async def verify_vaccine_record(image_url: str, standard: str = "us_cdc") -> str
         )
 
     try:
-        # 1. Download image
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(image_url)
-                if response.status_code == 404:
-                    return _create_error(
-                        "IMAGE_NOT_FOUND", 
-                        f"The image at {image_url} could not be found (404).",
-                        "Check the URL and try again."
-                    )
-                response.raise_for_status()
-                file_bytes = response.content
-            except httpx.RequestError as e:
+        # 1. Download image (shared pooled client)
+        client = _get_http_client()
+        try:
+            response = await client.get(image_url)
+            if response.status_code == 404:
                 return _create_error(
-                    "DOWNLOAD_ERROR", 
-                    f"Failed to download image: {str(e)}",
-                    "Ensure the URL is publicly accessible and valid."
+                    "IMAGE_NOT_FOUND",
+                    f"The image at {image_url} could not be found (404).",
+                    "Check the URL and try again."
                 )
-            
-        # 2. Process with AI (Brain)
+            response.raise_for_status()
+            file_bytes = response.content
+        except httpx.RequestError as e:
+            return _create_error(
+                "DOWNLOAD_ERROR",
+                f"Failed to download image: {str(e)}",
+                "Ensure the URL is publicly accessible and valid."
+            )
+
+
+        # 2. Downscale oversized scans, then process with AI (Brain)
         # Note: analyze_image_with_ai handles the OpenAI call
+        file_bytes = await asyncio.to_thread(downscale_image_for_ai, file_bytes)
         data = await analyze_image_with_ai(file_bytes, OPENAI_API_KEY)
         
         # 3. Map to schemas
@@ -108,34 +132,10 @@ async def verify_vaccine_record(image_url: str, standard: str = "us_cdc") -> str
         
         # 4. Standardize
         standardization = perform_standardization(standard, extracted_vaccines)
-        
+
         # 5. Construct Agent-Optimized Result (Flat & Token-Efficient)
-        
-        # Create simple lists for the agent
-        found_vax_names = [v.vaccine_name.value for v in standardization.records]
-        missing_vax_names = [v.value for v in standardization.missing_vaccines]
-        
-        # Create evidence dict (lighter than full objects)
-        evidence = {
-            "vaccines": [
-                {
-                    "name": v.vaccine_name.value,
-                    "date": v.date,
-                    "provider": v.provider
-                } for v in standardization.records
-            ],
-            "original_text_snippet": transcription.raw_text[:200] + "..." if len(transcription.raw_text) > 200 else transcription.raw_text
-        }
-        
-        response_model = AgentComplianceResponse(
-            is_compliant=standardization.is_compliant,
-            missing_vaccines=missing_vax_names,
-            extracted_vaccines=found_vax_names,
-            compliance_summary=standardization.compliance_notes or "Analysis complete.",
-            evidence=evidence,
-            overall_confidence=transcription.confidence
-        )
-        
+        response_model = build_agent_response(standardization, transcription)
+
         # Return as JSON string
         return response_model.model_dump_json(indent=2)
         
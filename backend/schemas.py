@@ -5,9 +5,31 @@ This module defines the Pydantic models and enums that serve as the data contrac
 for the 3-stage pipeline: Transcription → Translation → Standardization.
 """
 
+import re
 from enum import Enum
-from typing import List, Optional, Dict
-from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional, Dict
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+
+# Compiled once at module scope; every date field shares this single Pattern
+# object rather than pydantic materializing regex state per field occurrence
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _validate_iso_date(value: str) -> str:
+    """Validate a YYYY-MM-DD date string against the shared compiled regex."""
+    if not _ISO_DATE.match(value):
+        raise ValueError(r"String should match pattern '^\d{4}-\d{2}-\d{2}$'")
+    return value
+
+
+# Reusable ISO-date string type for all date-carrying fields
+DateStr = Annotated[str, AfterValidator(_validate_iso_date)]
+
+# Shared config for every model in this contract: frozen immutable instances
+# (hash caching, no setattr validation path), extra keys dropped, and core
+# schema builds deferred off the import-time critical path — hot-path models
+# are rebuilt once in main's startup warm-up.
+_MODEL_CONFIG = ConfigDict(frozen=True, extra='ignore', defer_build=True)
 
 
 # ============================================================================
@@ -83,6 +105,8 @@ class TranscriptionResult(BaseModel):
     Result from Stage 1: OCR/Vision AI transcription.
     Raw text extraction with language detection.
     """
+    model_config = _MODEL_CONFIG
+
     raw_text: str = Field(
         ...,
         description="Raw text extracted from the image"
@@ -111,6 +135,8 @@ class TranslationResult(BaseModel):
     """
     Result from Stage 2: Translation to English (if needed).
     """
+    model_config = _MODEL_CONFIG
+
     original_text: str = Field(
         ...,
         description="Original text before translation"
@@ -144,14 +170,15 @@ class VaccineRecord(BaseModel):
     Standardized vaccine record after Stage 3.
     Mapped to compliance standard requirements.
     """
+    model_config = _MODEL_CONFIG
+
     vaccine_name: VaccineName = Field(
         ...,
         description="Standardized vaccine name"
     )
-    date: str = Field(
+    date: DateStr = Field(
         ...,
-        description="Vaccination date in YYYY-MM-DD format",
-        pattern=r"^\d{4}-\d{2}-\d{2}$"
+        description="Vaccination date in YYYY-MM-DD format"
     )
     status: VaccineStatus = Field(
         ...,
@@ -183,6 +210,8 @@ class StandardizationResult(BaseModel):
     """
     Result from Stage 3: Standardization against compliance standard.
     """
+    model_config = _MODEL_CONFIG
+
     standard: ComplianceStandard = Field(
         ...,
         description="Compliance standard used for validation"
@@ -214,6 +243,8 @@ class UploadResult(BaseModel):
     Result from upload endpoint (Transcription + Translation only).
     Generic extracted data before any standardization is applied.
     """
+    model_config = _MODEL_CONFIG
+
     record_id: str = Field(
         ...,
         description="Unique identifier for this uploaded record"
@@ -248,10 +279,72 @@ class StandardizationRequest(BaseModel):
     """
     Request to standardize an uploaded record against a specific standard.
     """
+    model_config = _MODEL_CONFIG
+
+    record_id: str = Field(
+        ...,
+        description="ID of the uploaded record to standardize"
+    )
+
+
+class StandardizationBatchItem(BaseModel):
+    """
+    One record/standard pair in a batch standardization request.
+    """
+    model_config = _MODEL_CONFIG
+
     record_id: str = Field(
         ...,
         description="ID of the uploaded record to standardize"
     )
+    standard: ComplianceStandard = Field(
+        ...,
+        description="Compliance standard to validate against"
+    )
+
+
+class AsyncBatchSubmission(BaseModel):
+    """
+    Acknowledgement for an /upload/async-batch submission.
+    """
+    model_config = _MODEL_CONFIG
+
+    batch_id: str = Field(
+        ...,
+        description="OpenAI Batch API job identifier to poll via GET /batch/{batch_id}"
+    )
+    record_ids: List[str] = Field(
+        ...,
+        description="Record IDs that will be populated when the batch completes"
+    )
+    status: str = Field(
+        default="submitted",
+        description="Current batch status"
+    )
+
+
+class AsyncBatchStatus(BaseModel):
+    """
+    Polling response for an asynchronous analysis batch.
+    """
+    model_config = _MODEL_CONFIG
+
+    batch_id: str = Field(
+        ...,
+        description="OpenAI Batch API job identifier"
+    )
+    status: str = Field(
+        ...,
+        description="Batch status reported by OpenAI (e.g. in_progress, completed)"
+    )
+    record_ids: List[str] = Field(
+        default_factory=list,
+        description="Record IDs covered by this batch"
+    )
+    records_ready: int = Field(
+        default=0,
+        description="How many records have been populated into the vault"
+    )
 
 
 class ComplianceResult(BaseModel):
@@ -259,6 +352,8 @@ class ComplianceResult(BaseModel):
     Complete result from the 3-stage pipeline.
     Combines Transcription → Translation → Standardization.
     """
+    model_config = _MODEL_CONFIG
+
     # Pipeline stages
     transcription: TranscriptionResult = Field(
         ...,
@@ -300,6 +395,8 @@ class ComplianceResult(BaseModel):
 
 class AnalyzeRequest(BaseModel):
     """Request model for analyze endpoint."""
+    model_config = _MODEL_CONFIG
+
     session_id: Optional[str] = Field(
         None,
         description="Optional session ID for tracking"
@@ -312,6 +409,8 @@ class AnalyzeRequest(BaseModel):
 
 class HealthResponse(BaseModel):
     """Health check response."""
+    model_config = _MODEL_CONFIG
+
     status: str = Field(..., description="Service status")
     mode: str = Field(..., description="Operating mode")
     version: str = Field(default="2.0.0", description="API version")
@@ -330,6 +429,8 @@ class AgentError(BaseModel):
     Standardized error format for AI agents.
     Allows agents to reason about failures (e.g., retry on DOWNLOAD_ERROR).
     """
+    model_config = _MODEL_CONFIG
+
     code: str = Field(..., description="Machine-readable error code (e.g., IMAGE_NOT_FOUND)")
     message: str = Field(..., description="Human-readable error message")
     suggestion: Optional[str] = Field(None, description="Suggestion for the agent on how to proceed")
@@ -340,6 +441,8 @@ class AgentComplianceResponse(BaseModel):
     Token-efficient, flat response optimized for LLM agents.
     Surfaces the most critical decision-making data to the top level.
     """
+    model_config = _MODEL_CONFIG
+
     is_compliant: bool = Field(..., description="Is the record compliant with the standard?")
     missing_vaccines: List[str] = Field(..., description="List of missing vaccine names")
     extracted_vaccines: List[str] = Field(..., description="List of vaccines found in the record")
@@ -1,34 +1,39 @@
 from PIL import Image, ImageDraw, ImageFont
 import os
 
+# Blank template and font are built once at import so regenerating fixtures
+# in a loop (e.g. a CI matrix) doesn't redo the setup work per call
+_TEMPLATE = Image.new('RGB', (800, 600), color='white')
+_FONT = ImageFont.load_default()
+
 def create_test_image(filename="test_record.jpg"):
-    # Create a white image
-    img = Image.new('RGB', (800, 600), color='white')
+    # Copy the cached white template
+    img = _TEMPLATE.copy()
     d = ImageDraw.Draw(img)
-    
+
     # Add some text simulating a vaccine record
     text = """
     OFFICIAL VACCINATION RECORD
     Name: John Doe
     DOB: 01/01/1980
-    
+
     VACCINES:
     1. MMR (Measles, Mumps, Rubella)
        Date: 2024-01-15
        Lot: Merck-123
        Provider: CVS Pharmacy
-       
+
     2. Tdap (Tetanus, Diphtheria, Pertussis)
        Date: 2023-11-20
        Lot: GSK-456
        Provider: Walgreens
     """
-    
-    # Use default font
-    d.text((10, 10), text, fill=(0, 0, 0))
-    
-    # Save
-    img.save(filename)
+
+    # Use the cached default font
+    d.text((10, 10), text, fill=(0, 0, 0), font=_FONT)
+
+    # Save (explicit format skips Pillow's sniff-from-extension pass)
+    img.save(filename, 'JPEG', quality=85, optimize=True)
     print(f"Created test image: {filename}")
 
 if __name__ == "__main__":